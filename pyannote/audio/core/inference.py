@@ -22,6 +22,7 @@
 
 import math
 import warnings
+from contextlib import nullcontext
 from pathlib import Path
 from typing import Any, Callable, List, Optional, Text, Tuple, Union
 
@@ -77,6 +78,11 @@ class Inference:
         When loading a private huggingface.co model, set `use_auth_token`
         to True or to a string containing your hugginface.co authentication
         token that can be obtained by running `huggingface-cli login`
+    use_amp : bool, optional
+        Run forward passes under CUDA automatic mixed precision (bfloat16 on GPUs
+        with native support, i.e. Ampere or newer, float16 otherwise). Faster and
+        lighter, at the cost of slightly less precise outputs. Has no effect on CPU.
+        Defaults to False.
     """
 
     def __init__(
@@ -91,6 +97,7 @@ class Inference:
         pre_aggregation_hook: Callable[[np.ndarray], np.ndarray] = None,
         progress_hook: Union[bool, Text, Callable[[int, int], Any]] = False,
         use_auth_token: Union[Text, None] = None,
+        use_amp: bool = False,
     ):
 
         self.model = (
@@ -158,6 +165,7 @@ class Inference:
         self.step = step
 
         self.batch_size = batch_size
+        self.use_amp = use_amp
 
         if callable(progress_hook):
             pass
@@ -185,9 +193,22 @@ class Inference:
             Model output.
         """
 
-        with torch.no_grad():
+        device = torch.device(self.device)
+
+        if self.use_amp and device.type == "cuda":
+            # bfloat16 is only natively supported by Ampere (or newer) GPUs
+            if torch.cuda.get_device_capability(device)[0] >= 8:
+                dtype = torch.bfloat16
+            else:
+                dtype = torch.float16
+            autocast = torch.autocast("cuda", dtype=dtype)
+
+        else:
+            autocast = nullcontext()
+
+        with torch.no_grad(), autocast:
             try:
-                outputs = self.model(chunks.to(self.device))
+                outputs = self.model(chunks.to(device))
             except RuntimeError as exception:
                 if is_oom_error(exception):
                     raise MemoryError(
@@ -197,6 +218,10 @@ class Inference:
                 else:
                     raise exception
 
+        # numpy does not support bfloat16: send mixed precision outputs back to float32
+        if outputs.dtype in (torch.float16, torch.bfloat16):
+            outputs = outputs.float()
+
         return outputs.cpu().numpy()
 
     def slide(self, waveform: torch.Tensor, sample_rate: int) -> SlidingWindowFeature:
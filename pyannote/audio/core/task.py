@@ -28,6 +28,7 @@ import sys
 import warnings
 from dataclasses import dataclass
 from enum import Enum
+from functools import partial
 from numbers import Number
 from typing import List, Optional, Text, Tuple, Union
 
@@ -147,7 +148,17 @@ class Task(pl.LightningDataModule):
     pin_memory : bool, optional
         If True, data loaders will copy tensors into CUDA pinned
         memory before returning them. See pytorch documentation
-        for more details. Defaults to False.
+        for more details. Defaults to True when CUDA is available.
+    prefetch_factor : int, optional
+        Number of batches loaded in advance by each worker. Larger values
+        better hide data loading behind training, at the cost of a larger
+        (possibly pinned) memory footprint that may lead to out-of-memory
+        errors. Has no effect when `num_workers` is 0. Defaults to 2.
+    persistent_workers : bool, optional
+        Keep workers alive from one epoch to the next. Has no effect when
+        `num_workers` is 0. Defaults to False because training workers seed
+        their random number generator with the epoch they were started at:
+        persistent workers would generate the same training chunks every epoch.
     augmentation : BaseWaveformTransform, optional
         torch_audiomentations waveform transform, used by dataloader
         during training.
@@ -166,7 +177,9 @@ class Task(pl.LightningDataModule):
         warm_up: Union[float, Tuple[float, float]] = 0.0,
         batch_size: int = 32,
         num_workers: int = None,
-        pin_memory: bool = False,
+        pin_memory: bool = None,
+        prefetch_factor: int = 2,
+        persistent_workers: bool = False,
         augmentation: BaseWaveformTransform = None,
     ):
         super().__init__()
@@ -183,6 +196,8 @@ class Task(pl.LightningDataModule):
         if isinstance(warm_up, Number):
             warm_up = (warm_up, warm_up)
         self.warm_up = warm_up
+        # number of warm-up frames, indexed by number of frames per chunk
+        self._warm_up_frames = dict()
 
         # multi-processing
         if num_workers is None:
@@ -201,7 +216,13 @@ class Task(pl.LightningDataModule):
             num_workers = 0
 
         self.num_workers = num_workers
+
+        if pin_memory is None:
+            pin_memory = torch.cuda.is_available()
         self.pin_memory = pin_memory
+
+        self.prefetch_factor = prefetch_factor
+        self.persistent_workers = persistent_workers
         self.augmentation = augmentation
 
     def prepare_data(self):
@@ -246,14 +267,35 @@ class Task(pl.LightningDataModule):
         msg = f"Missing '{self.__class__.__name__}.train__len__' method."
         raise NotImplementedError(msg)
 
-    def collate_fn(self, batch):
-        collated_batch = default_collate(batch)
-        if self.augmentation is not None:
+    def collate_y(self, batch) -> torch.Tensor:
+        """Collate targets
+
+        Override this method when targets cannot be collated as they are
+        (e.g. because they do not have the same shape for all samples).
+        """
+        return default_collate([sample["y"] for sample in batch])
+
+    def collate_fn(self, batch, stage: Literal["train", "val"] = "train"):
+        collated_batch = default_collate(
+            [{key: value for key, value in b.items() if key != "y"} for b in batch]
+        )
+        collated_batch["y"] = self.collate_y(batch)
+        if stage == "train" and self.augmentation is not None:
             collated_batch["X"] = self.augmentation(
                 collated_batch["X"], sample_rate=self.model.hparams.sample_rate
             )
         return collated_batch
 
+    @property
+    def _workers_kwargs(self) -> dict:
+        # DataLoader complains when those are set without workers
+        if self.num_workers == 0:
+            return dict()
+        return {
+            "prefetch_factor": self.prefetch_factor,
+            "persistent_workers": self.persistent_workers,
+        }
+
     def train_dataloader(self) -> DataLoader:
         return DataLoader(
             TrainDataset(self),
@@ -261,9 +303,34 @@ class Task(pl.LightningDataModule):
             num_workers=self.num_workers,
             pin_memory=self.pin_memory,
             drop_last=True,
-            collate_fn=self.collate_fn,
+            collate_fn=partial(self.collate_fn, stage="train"),
+            **self._workers_kwargs,
         )
 
+    def warm_up_frames(self, num_frames: int) -> Tuple[int, int]:
+        """Number of warm-up frames on the left- and rightmost parts of each chunk
+
+        Those only depend on the number of frames per chunk and are therefore
+        computed only once for each of them.
+
+        Parameters
+        ----------
+        num_frames : int
+            Number of frames per chunk.
+
+        Returns
+        -------
+        warm_up_left, warm_up_right : int
+            Number of left and right warm-up frames.
+        """
+
+        if num_frames not in self._warm_up_frames:
+            self._warm_up_frames[num_frames] = (
+                round(self.warm_up[0] / self.duration * num_frames),
+                round(self.warm_up[1] / self.duration * num_frames),
+            )
+        return self._warm_up_frames[num_frames]
+
     def default_loss(
         self, specifications: Specifications, target, prediction, weight=None
     ) -> torch.Tensor:
@@ -336,19 +403,18 @@ class Task(pl.LightningDataModule):
         # target
         y = batch["y"]
 
-        # frames weight
+        # frames weight (None means uniform weight)
         weight_key = getattr(self, "weight", None) if stage == "train" else None
-        weight = batch.get(
-            weight_key,
-            torch.ones(batch_size, num_frames, 1, device=self.model.device),
-        )
+        weight = batch.get(weight_key, None)
         # (batch_size, num_frames, 1)
 
         # warm-up
-        warm_up_left = round(self.warm_up[0] / self.duration * num_frames)
-        weight[:, :warm_up_left] = 0.0
-        warm_up_right = round(self.warm_up[1] / self.duration * num_frames)
-        weight[:, num_frames - warm_up_right :] = 0.0
+        warm_up_left, warm_up_right = self.warm_up_frames(num_frames)
+        if warm_up_left > 0 or warm_up_right > 0:
+            if weight is None:
+                weight = torch.ones(batch_size, num_frames, 1, device=y_pred.device)
+            weight[:, :warm_up_left] = 0.0
+            weight[:, num_frames - warm_up_right :] = 0.0
 
         # compute loss
         loss = self.default_loss(self.specifications, y, y_pred, weight=weight)
@@ -385,6 +451,8 @@ class Task(pl.LightningDataModule):
                 num_workers=self.num_workers,
                 pin_memory=self.pin_memory,
                 drop_last=False,
+                collate_fn=partial(self.collate_fn, stage="val"),
+                **self._workers_kwargs,
             )
         else:
             return None
@@ -63,7 +63,17 @@ class SupervisedRepresentationLearningWithArcFace(
     pin_memory : bool, optional
         If True, data loaders will copy tensors into CUDA pinned
         memory before returning them. See pytorch documentation
-        for more details. Defaults to False.
+        for more details. Defaults to True when CUDA is available.
+    prefetch_factor : int, optional
+        Number of batches loaded in advance by each worker. Larger values
+        better hide data loading behind training, at the cost of a larger
+        (possibly pinned) memory footprint that may lead to out-of-memory
+        errors. Has no effect when `num_workers` is 0. Defaults to 2.
+    persistent_workers : bool, optional
+        Keep workers alive from one epoch to the next. Has no effect when
+        `num_workers` is 0. Defaults to False because training workers seed
+        their random number generator with the epoch they were started at:
+        persistent workers would generate the same training chunks every epoch.
     augmentation : BaseWaveformTransform, optional
         torch_audiomentations waveform transform, used by dataloader
         during training.
@@ -85,7 +95,9 @@ class SupervisedRepresentationLearningWithArcFace(
         margin: float = 28.6,
         scale: float = 64.0,
         num_workers: int = None,
-        pin_memory: bool = False,
+        pin_memory: bool = None,
+        prefetch_factor: int = 2,
+        persistent_workers: bool = False,
         augmentation: BaseWaveformTransform = None,
     ):
 
@@ -102,6 +114,8 @@ class SupervisedRepresentationLearningWithArcFace(
             batch_size=self.batch_size,
             num_workers=num_workers,
             pin_memory=pin_memory,
+            prefetch_factor=prefetch_factor,
+            persistent_workers=persistent_workers,
             augmentation=augmentation,
         )
 
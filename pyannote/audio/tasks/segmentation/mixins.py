@@ -477,8 +477,7 @@ class SegmentationTaskMixin:
 
         # - remove warm-up frames
         # - downsample remaining frames
-        warm_up_left = round(self.warm_up[0] / self.duration * num_frames)
-        warm_up_right = round(self.warm_up[1] / self.duration * num_frames)
+        warm_up_left, warm_up_right = self.warm_up_frames(num_frames)
         preds = y_pred[:, warm_up_left : num_frames - warm_up_right : 10]
         target = y[:, warm_up_left : num_frames - warm_up_right : 10]
 
@@ -20,7 +20,6 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from collections import Counter
 from typing import Optional, Text, Tuple, Union
 
 import numpy as np
@@ -30,12 +29,42 @@ from typing_extensions import Literal
 
 from pyannote.audio.core.task import Problem, Resolution, Specifications, Task
 from pyannote.audio.tasks.segmentation.mixins import SegmentationTaskMixin
-from pyannote.audio.utils.loss import binary_cross_entropy, mse_loss
+from pyannote.audio.utils.loss import binary_cross_entropy, interpolate, mse_loss
 from pyannote.audio.utils.permutation import permutate
-from pyannote.core import SlidingWindow
+from pyannote.core import Annotation
 from pyannote.database import Protocol
 
 
+def _annotation_to_soa(
+    annotation: Annotation,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Convert annotation to parallel arrays of segment boundaries and labels
+
+    Parameters
+    ----------
+    annotation : Annotation
+        Annotation.
+
+    Returns
+    -------
+    starts : (num_segments, ) np.ndarray
+        Segments start times.
+    ends : (num_segments, ) np.ndarray
+        Segments end times.
+    labels : (num_segments, ) np.ndarray
+        Segments labels, as indices in `annotation.labels()`.
+    """
+
+    label_index = {label: k for k, label in enumerate(annotation.labels())}
+
+    tracks = list(annotation.itertracks(yield_label=True))
+    starts = np.array([segment.start for segment, _, _ in tracks], dtype=np.float64)
+    ends = np.array([segment.end for segment, _, _ in tracks], dtype=np.float64)
+    labels = np.array([label_index[label] for _, _, label in tracks], dtype=np.int32)
+
+    return starts, ends, labels
+
+
 class Segmentation(SegmentationTaskMixin, Task):
     """Speaker segmentation
 
@@ -76,7 +105,17 @@ class Segmentation(SegmentationTaskMixin, Task):
     pin_memory : bool, optional
         If True, data loaders will copy tensors into CUDA pinned
         memory before returning them. See pytorch documentation
-        for more details. Defaults to False.
+        for more details. Defaults to True when CUDA is available.
+    prefetch_factor : int, optional
+        Number of batches loaded in advance by each worker. Larger values
+        better hide data loading behind training, at the cost of a larger
+        (possibly pinned) memory footprint that may lead to out-of-memory
+        errors. Has no effect when `num_workers` is 0. Defaults to 2.
+    persistent_workers : bool, optional
+        Keep workers alive from one epoch to the next. Has no effect when
+        `num_workers` is 0. Defaults to False because training workers seed
+        their random number generator with the epoch they were started at:
+        persistent workers would generate the same training chunks every epoch.
     augmentation : BaseWaveformTransform, optional
         torch_audiomentations waveform transform, used by dataloader
         during training.
@@ -105,7 +144,9 @@ class Segmentation(SegmentationTaskMixin, Task):
         weight: Text = None,
         batch_size: int = 32,
         num_workers: int = None,
-        pin_memory: bool = False,
+        pin_memory: bool = None,
+        prefetch_factor: int = 2,
+        persistent_workers: bool = False,
         augmentation: BaseWaveformTransform = None,
         loss: Literal["bce", "mse"] = "bce",
         vad_loss: Literal["bce", "mse"] = None,
@@ -118,6 +159,8 @@ class Segmentation(SegmentationTaskMixin, Task):
             batch_size=batch_size,
             num_workers=num_workers,
             pin_memory=pin_memory,
+            prefetch_factor=prefetch_factor,
+            persistent_workers=persistent_workers,
             augmentation=augmentation,
         )
 
@@ -137,33 +180,62 @@ class Segmentation(SegmentationTaskMixin, Task):
 
         if self.max_num_speakers is None:
 
-            # TODO: optimize this
-
             # slide a window (with 1s step) over the whole training set
             # and keep track of the number of speakers in each location
-            num_speakers = []
-            for file in self._train:
-                start = file["annotated"][0].start
-                end = file["annotated"][-1].end
-                window = SlidingWindow(
-                    start=start, end=end, duration=self.duration, step=1.0,
+            all_chunk_starts = [
+                np.arange(file["annotated"][0].start, file["annotated"][-1].end, 1.0)
+                for file in self._train
+            ]
+            total_num_chunks = sum(len(starts) for starts in all_chunk_starts)
+            num_speakers = np.empty((total_num_chunks,), dtype=np.int32)
+            c = 0
+
+            for file, chunk_starts in zip(self._train, all_chunk_starts):
+
+                # chunks start times (and end times)
+                chunk_ends = chunk_starts + self.duration
+                num_chunks = len(chunk_starts)
+
+                # segments start times, end times, and (integer) labels
+                segment_starts, segment_ends, segment_labels = _annotation_to_soa(
+                    file["annotation"]
                 )
-                for chunk in window:
-                    num_speakers.append(len(file["annotation"].crop(chunk).labels()))
+
+                # each segment overlaps with chunks whose index is in [first, last)
+                first = np.searchsorted(chunk_ends, segment_starts, side="right")
+                last = np.searchsorted(chunk_starts, segment_ends, side="left")
+                keep = first < last
+                first, last = first[keep], last[keep]
+                segment_labels = segment_labels[keep]
+
+                # sort ranges by label, then by first chunk, and shift them so that
+                # ranges of different labels never overlap with each other
+                order = np.lexsort((first, segment_labels))
+                offset = segment_labels[order].astype(np.int64) * (num_chunks + 1)
+                first, last = first[order] + offset, last[order] + offset
+
+                # only keep the part of each range that is not already covered
+                # by previous ranges of the same label: this makes ranges disjoint
+                covered = np.roll(np.maximum.accumulate(last), 1)
+                covered[:1] = 0
+                first = np.maximum(first, covered) - offset
+                last = np.maximum(last, covered) - offset
+
+                # number of distinct labels active in each chunk
+                np.cumsum(
+                    np.bincount(first, minlength=num_chunks + 1)[:num_chunks]
+                    - np.bincount(last, minlength=num_chunks + 1)[:num_chunks],
+                    out=num_speakers[c : c + num_chunks],
+                )
+                c += num_chunks
 
             # because there might a few outliers, estimate the upper bound for the
             # number of speakers as the 99th percentile
 
-            num_speakers, counts = zip(*list(Counter(num_speakers).items()))
-            num_speakers, counts = np.array(num_speakers), np.array(counts)
-
-            sorting_indices = np.argsort(num_speakers)
-            num_speakers = num_speakers[sorting_indices]
-            counts = counts[sorting_indices]
-
+            counts = np.bincount(num_speakers)
+            cumulative = np.cumsum(counts) / np.sum(counts)
             self.max_num_speakers = max(
-                2,
-                num_speakers[np.where(np.cumsum(counts) / np.sum(counts) > 0.99)[0][0]],
+                2, int(np.searchsorted(cumulative, 0.99, side="right"))
             )
 
         # now that we know about the number of speakers upper bound
@@ -178,7 +250,9 @@ class Segmentation(SegmentationTaskMixin, Task):
         )
 
     def prepare_y(self, one_hot_y: np.ndarray):
-        """Zero-pad segmentation targets
+        """Check segmentation targets
+
+        Zero-padding to `self.max_num_speakers` is deferred to `collate_y`.
 
         Parameters
         ----------
@@ -189,10 +263,12 @@ class Segmentation(SegmentationTaskMixin, Task):
 
         Returns
         -------
-        padded_one_hot_y : (num_frames, self.max_num_speakers) np.ndarray
-            One-hot-encoding of current chunk speaker activity:
-                * one_hot_y[t, k] = 1 if kth speaker is active at tth frame
-                * one_hot_y[t, k] = 0 otherwise.
+        one_hot_y : (num_frames, num_speakers) np.ndarray
+            Same as input.
+
+        Raises
+        ------
+        ValueError when num_speakers is greater than self.max_num_speakers.
         """
 
         num_frames, num_speakers = one_hot_y.shape
@@ -200,27 +276,47 @@ class Segmentation(SegmentationTaskMixin, Task):
         if num_speakers > self.max_num_speakers:
             raise ValueError()
 
-        if num_speakers < self.max_num_speakers:
-            one_hot_y = np.pad(
-                one_hot_y, ((0, 0), (0, self.max_num_speakers - num_speakers))
-            )
-
         return one_hot_y
 
+    def collate_y(self, batch) -> torch.Tensor:
+        """Zero-pad and collate segmentation targets
+
+        Parameters
+        ----------
+        batch : list of dict
+            Samples, with "y" entry as (num_frames, num_speakers) np.ndarray,
+            where num_speakers may vary from one sample to another.
+
+        Returns
+        -------
+        collated_y : (batch_size, num_frames, self.max_num_speakers) torch.Tensor
+            Zero-padded segmentation targets.
+        """
+
+        first_y = torch.from_numpy(batch[0]["y"])
+        num_frames, _ = first_y.shape
+
+        collated_y = torch.zeros(
+            (len(batch), num_frames, self.max_num_speakers), dtype=first_y.dtype
+        )
+        for b, sample in enumerate(batch):
+            _, num_speakers = sample["y"].shape
+            collated_y[b, :, :num_speakers] = torch.from_numpy(sample["y"])
+
+        return collated_y
+
     def val__getitem__(self, idx):
 
         f, chunk = self._validation[idx]
         sample = self.prepare_chunk(f, chunk, duration=self.duration, stage="val")
-        y, labels = sample["y"], sample.pop("labels")
+        _ = sample.pop("labels")
 
         # since number of speakers is estimated from the training set,
         # we might encounter validation chunks that have more speakers.
-        # in that case, we arbitrarily remove last speakers
-        if y.shape[1] > self.max_num_speakers:
-            y = y[:, : self.max_num_speakers]
-            labels = labels[: self.max_num_speakers]
+        # in that case, we arbitrarily remove last speakers.
+        # zero-padding (for chunks with fewer speakers) happens in `collate_y`.
+        sample["y"] = sample["y"][:, : self.max_num_speakers]
 
-        sample["y"] = self.prepare_y(y)
         return sample
 
     def segmentation_loss(
@@ -236,7 +332,7 @@ class Segmentation(SegmentationTaskMixin, Task):
         permutated_prediction : (batch_size, num_frames, num_classes) torch.Tensor
             Permutated speaker activity predictions.
         target : (batch_size, num_frames, num_speakers) torch.Tensor
-            Speaker activity.
+            Speaker activity, as float tensor.
         weight : (batch_size, num_frames, 1) torch.Tensor, optional
             Frames weight.
 
@@ -248,11 +344,11 @@ class Segmentation(SegmentationTaskMixin, Task):
 
         if self.loss == "bce":
             seg_loss = binary_cross_entropy(
-                permutated_prediction, target.float(), weight=weight
+                permutated_prediction, target, weight=weight
             )
 
         elif self.loss == "mse":
-            seg_loss = mse_loss(permutated_prediction, target.float(), weight=weight)
+            seg_loss = mse_loss(permutated_prediction, target, weight=weight)
 
         return seg_loss
 
@@ -269,7 +365,7 @@ class Segmentation(SegmentationTaskMixin, Task):
         permutated_prediction : (batch_size, num_frames, num_classes) torch.Tensor
             Speaker activity predictions.
         target : (batch_size, num_frames, num_speakers) torch.Tensor
-            Speaker activity.
+            Speaker activity, as float tensor.
         weight : (batch_size, num_frames, 1) torch.Tensor, optional
             Frames weight.
 
@@ -279,10 +375,11 @@ class Segmentation(SegmentationTaskMixin, Task):
             Voice activity detection loss.
         """
 
-        vad_prediction, _ = torch.max(permutated_prediction, dim=2, keepdim=True)
+        # use amax rather than max as we do not need the (int64) indices
+        vad_prediction = torch.amax(permutated_prediction, dim=2, keepdim=True)
         # (batch_size, num_frames, 1)
 
-        vad_target, _ = torch.max(target.float(), dim=2, keepdim=False)
+        vad_target = torch.amax(target, dim=2, keepdim=False)
         # (batch_size, num_frames)
 
         if self.vad_loss == "bce":
@@ -311,26 +408,31 @@ class Segmentation(SegmentationTaskMixin, Task):
 
         # forward pass
         prediction = self.model(batch["X"])
-        batch_size, num_frames, _ = prediction.shape
+        _, num_frames, _ = prediction.shape
         # (batch_size, num_frames, num_classes)
 
-        # target
-        target = batch["y"]
+        # target (converted to float once and for all, for both losses)
+        target = batch["y"].float()
 
         permutated_prediction, _ = permutate(target, prediction)
 
-        # frames weight
+        # frames weight (None means uniform weight)
         weight_key = getattr(self, "weight", None)
-        weight = batch.get(
-            weight_key, torch.ones(batch_size, num_frames, 1, device=self.model.device),
-        )
-        # (batch_size, num_frames, 1)
-
-        # warm-up
-        warm_up_left = round(self.warm_up[0] / self.duration * num_frames)
-        weight[:, :warm_up_left] = 0.0
-        warm_up_right = round(self.warm_up[1] / self.duration * num_frames)
-        weight[:, num_frames - warm_up_right :] = 0.0
+        weight = batch.get(weight_key, None)
+
+        # interpolate weight to match target frame resolution
+        if weight is not None:
+            weight = interpolate(target, weight=weight)
+            # (batch_size, num_frames, 1)
+
+        # only compute loss on central (i.e. non warm-up) frames
+        warm_up_left, warm_up_right = self.warm_up_frames(num_frames)
+        if warm_up_left > 0 or warm_up_right > 0:
+            central = slice(warm_up_left, num_frames - warm_up_right)
+            permutated_prediction = permutated_prediction[:, central]
+            target = target[:, central]
+            if weight is not None:
+                weight = weight[:, central]
 
         seg_loss = self.segmentation_loss(permutated_prediction, target, weight=weight)
 
@@ -401,7 +503,7 @@ def main(protocol: str, subset: str = "test", model: str = "pyannote/segmentatio
             progress.update(file_task, completed=completed / total)
 
         inference = Inference(
-            model, device=device, progress_hook=progress_hook
+            model, device=device, use_amp=True, progress_hook=progress_hook
         )
 
         for file in files:
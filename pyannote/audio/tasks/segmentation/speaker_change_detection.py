@@ -72,7 +72,17 @@ class SpeakerChangeDetection(SegmentationTaskMixin, Task):
     pin_memory : bool, optional
         If True, data loaders will copy tensors into CUDA pinned
         memory before returning them. See pytorch documentation
-        for more details. Defaults to False.
+        for more details. Defaults to True when CUDA is available.
+    prefetch_factor : int, optional
+        Number of batches loaded in advance by each worker. Larger values
+        better hide data loading behind training, at the cost of a larger
+        (possibly pinned) memory footprint that may lead to out-of-memory
+        errors. Has no effect when `num_workers` is 0. Defaults to 2.
+    persistent_workers : bool, optional
+        Keep workers alive from one epoch to the next. Has no effect when
+        `num_workers` is 0. Defaults to False because training workers seed
+        their random number generator with the epoch they were started at:
+        persistent workers would generate the same training chunks every epoch.
     augmentation : BaseWaveformTransform, optional
         torch_audiomentations waveform transform, used by dataloader
         during training.
@@ -90,7 +100,9 @@ class SpeakerChangeDetection(SegmentationTaskMixin, Task):
         collar: int = 1,
         batch_size: int = 32,
         num_workers: int = None,
-        pin_memory: bool = False,
+        pin_memory: bool = None,
+        prefetch_factor: int = 2,
+        persistent_workers: bool = False,
         augmentation: BaseWaveformTransform = None,
     ):
 
@@ -101,6 +113,8 @@ class SpeakerChangeDetection(SegmentationTaskMixin, Task):
             batch_size=batch_size,
             num_workers=num_workers,
             pin_memory=pin_memory,
+            prefetch_factor=prefetch_factor,
+            persistent_workers=persistent_workers,
             augmentation=augmentation,
         )
 
@@ -143,7 +157,7 @@ class SpeakerChangeDetection(SegmentationTaskMixin, Task):
         # mark frames in the neighborhood of actual change point as positive.
         window = scipy.signal.triang(2 * self.collar + 1)[:, np.newaxis]
         y = np.minimum(1, scipy.signal.convolve(y, window, mode="same"))
-        y = 1 * (y > 1e-10)
+        y = np.int8(y > 1e-10)
 
         # at this point, all segment boundaries are marked as change, including non-speech/speaker changes.
         # let's remove non-speech/speaker change
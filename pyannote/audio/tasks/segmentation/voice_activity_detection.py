@@ -65,7 +65,17 @@ class VoiceActivityDetection(SegmentationTaskMixin, Task):
     pin_memory : bool, optional
         If True, data loaders will copy tensors into CUDA pinned
         memory before returning them. See pytorch documentation
-        for more details. Defaults to False.
+        for more details. Defaults to True when CUDA is available.
+    prefetch_factor : int, optional
+        Number of batches loaded in advance by each worker. Larger values
+        better hide data loading behind training, at the cost of a larger
+        (possibly pinned) memory footprint that may lead to out-of-memory
+        errors. Has no effect when `num_workers` is 0. Defaults to 2.
+    persistent_workers : bool, optional
+        Keep workers alive from one epoch to the next. Has no effect when
+        `num_workers` is 0. Defaults to False because training workers seed
+        their random number generator with the epoch they were started at:
+        persistent workers would generate the same training chunks every epoch.
     augmentation : BaseWaveformTransform, optional
         torch_audiomentations waveform transform, used by dataloader
         during training.
@@ -82,7 +92,9 @@ class VoiceActivityDetection(SegmentationTaskMixin, Task):
         weight: Text = None,
         batch_size: int = 32,
         num_workers: int = None,
-        pin_memory: bool = False,
+        pin_memory: bool = None,
+        prefetch_factor: int = 2,
+        persistent_workers: bool = False,
         augmentation: BaseWaveformTransform = None,
     ):
 
@@ -93,6 +105,8 @@ class VoiceActivityDetection(SegmentationTaskMixin, Task):
             batch_size=batch_size,
             num_workers=num_workers,
             pin_memory=pin_memory,
+            prefetch_factor=prefetch_factor,
+            persistent_workers=persistent_workers,
             augmentation=augmentation,
         )
 
@@ -124,4 +138,4 @@ class VoiceActivityDetection(SegmentationTaskMixin, Task):
         y : (num_frames, ) np.ndarray
             y[t] = 1 if at least one speaker is active at tth frame, 0 otherwise.
         """
-        return np.int64(np.sum(one_hot_y, axis=1) > 0)
+        return np.int8(np.sum(one_hot_y, axis=1) > 0)
@@ -74,18 +74,64 @@ def binary_cross_entropy(
     loss : torch.Tensor
     """
 
+    # reshape target to (batch_size, num_frames, num_classes) even if num_classes is 1
+    if len(target.shape) == 2:
+        target = target.unsqueeze(dim=2)
+
+    # F.binary_cross_entropy is not autocast-safe (e.g. when training with
+    # Trainer(precision=16)): disable autocast and compute it in float32.
+    with torch.autocast(device_type=prediction.device.type, enabled=False):
+
+        if weight is None:
+            return F.binary_cross_entropy(prediction.float(), target.float())
+
+        else:
+            # interpolate weight
+            weight = interpolate(target, weight=weight)
+
+            return F.binary_cross_entropy(
+                prediction.float(),
+                target.float(),
+                weight=weight.float().expand(target.shape),
+            )
+
+
+def binary_cross_entropy_with_logits(
+    prediction: torch.Tensor, target: torch.Tensor, weight: torch.Tensor = None
+) -> torch.Tensor:
+    """Frame-weighted binary cross entropy (with logits)
+
+    Same as `binary_cross_entropy` but expects logits rather than probabilities.
+    Sigmoid and binary cross entropy are fused into a single, numerically stable
+    (and autocast-safe) operation.
+
+    Parameters
+    ----------
+    prediction : torch.Tensor
+        Prediction logits with shape (batch_size, num_frames, num_classes).
+    target : torch.Tensor
+        Target with shape (batch_size, num_frames) for binary or multi-class classification,
+        or (batch_size, num_frames, num_classes) for multi-label classification.
+    weight : (batch_size, num_frames, 1) torch.Tensor, optional
+        Frame weight with shape (batch_size, num_frames, 1).
+
+    Returns
+    -------
+    loss : torch.Tensor
+    """
+
     # reshape target to (batch_size, num_frames, num_classes) even if num_classes is 1
     if len(target.shape) == 2:
         target = target.unsqueeze(dim=2)
 
     if weight is None:
-        return F.binary_cross_entropy(prediction, target.float())
+        return F.binary_cross_entropy_with_logits(prediction, target.float())
 
     else:
         # interpolate weight
         weight = interpolate(target, weight=weight)
 
-        return F.binary_cross_entropy(
+        return F.binary_cross_entropy_with_logits(
             prediction, target.float(), weight=weight.expand(target.shape)
         )
 
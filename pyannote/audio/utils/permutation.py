@@ -117,27 +117,42 @@ def permutate_torch(
         msg = f"Shape mismatch: {tuple(y1.shape)} vs. {tuple(y2.shape)}."
         raise ValueError(msg)
 
-    if cost_func is None:
-        cost_func = mse_cost_func
+    with torch.no_grad():
+        if cost_func is None:
+            # default mean squared error cost is computed for all samples and
+            # all pairs of classes at once, using (y2 - y1)² = y2² - 2 y1 y2 + y1²
+            # to avoid materializing a (batch_size, num_samples, num_classes_1,
+            # num_classes_2) tensor of differences.
+            # this expanded form cancels out large terms: compute it in (at least)
+            # single precision, even under autocast, and clamp rounding errors.
+            dtype = torch.float64 if y2.dtype == torch.float64 else torch.float32
+            with torch.autocast(device_type=y2.device.type, enabled=False):
+                y1_, y2_ = y1.to(dtype), y2.to(dtype)
+                costs = (
+                    torch.sum(y2_ ** 2, dim=1, keepdim=True)
+                    - 2 * torch.einsum("bti,btj->bij", y1_, y2_)
+                    + torch.sum(y1_ ** 2, dim=1).unsqueeze(2)
+                ) / num_samples
+            costs = torch.clamp(costs, min=0.0)
+        else:
+            costs = torch.stack(
+                [
+                    torch.stack(
+                        [
+                            cost_func(y2_, y1_[:, i : i + 1].expand(-1, num_classes_2))
+                            for i in range(num_classes_1)
+                        ]
+                    )
+                    for y1_, y2_ in zip(y1, y2)
+                ]
+            )
+        # (batch_size, num_classes_1, num_classes_2)
 
     permutations = []
-    permutated_y2 = []
-
-    if return_cost:
-        costs = []
-
     permutated_y2 = torch.zeros(y1.shape, device=y2.device, dtype=y2.dtype)
 
-    for b, (y1_, y2_) in enumerate(zip(y1, y2)):
-        # y1_ is (num_samples, num_classes_1)-shaped
-        # y2_ is (num_samples, num_classes_2)-shaped
-        with torch.no_grad():
-            cost = torch.stack(
-                [
-                    cost_func(y2_, y1_[:, i : i + 1].expand(-1, num_classes_2))
-                    for i in range(num_classes_1)
-                ],
-            )
+    # linear_sum_assignment runs on CPU: send all costs at once
+    for b, cost in enumerate(costs.cpu()):
 
         if num_classes_2 > num_classes_1:
             padded_cost = F.pad(
@@ -150,17 +165,15 @@ def permutate_torch(
             padded_cost = cost
 
         permutation = [None] * num_classes_1
-        for k1, k2 in zip(*linear_sum_assignment(padded_cost.cpu())):
+        for k1, k2 in zip(*linear_sum_assignment(padded_cost)):
             if k1 < num_classes_1:
                 permutation[k1] = k2
-                permutated_y2[b, :, k1] = y2_[:, k2]
+                permutated_y2[b, :, k1] = y2[b, :, k2]
         permutations.append(tuple(permutation))
 
-        if return_cost:
-            costs.append(cost)
-
     if return_cost:
-        return permutated_y2, permutations, torch.stack(costs)
+        # costs might have been computed with higher precision than y2
+        return permutated_y2, permutations, costs.to(y2.dtype)
 
     return permutated_y2, permutations
 
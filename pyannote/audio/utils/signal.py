@@ -31,7 +31,6 @@
 """
 
 from functools import singledispatch
-from itertools import zip_longest
 from typing import Optional, Union
 
 import einops
@@ -121,22 +120,17 @@ def binarize_ndarray(
     on = scores > onset
     off_or_on = (scores < offset) | on
 
-    # indices of frames for which the on/off state is well-defined
-    well_defined_idx = np.array(
-        list(zip_longest(*[np.nonzero(oon)[0] for oon in off_or_on], fillvalue=-1))
-    ).T
-
-    # corner case where well_defined_idx is empty
-    if not well_defined_idx.size:
-        return np.zeros_like(scores, dtype=bool) | initial_state
-
-    # points to the index of the previous well-defined frame
-    same_as = np.cumsum(off_or_on, axis=1)
+    # for each frame, index of the last frame (up to this one) for
+    # which the on/off state is well-defined (-1 if there is none)
+    well_defined_idx = np.where(off_or_on, np.arange(num_frames), -1)
+    last_well_defined_idx = np.maximum.accumulate(well_defined_idx, axis=1)
 
     samples = np.tile(np.arange(batch_size), (num_frames, 1)).T
 
     return np.where(
-        same_as, on[samples, well_defined_idx[samples, same_as - 1]], initial_state
+        last_well_defined_idx >= 0,
+        on[samples, last_well_defined_idx],
+        initial_state,
     )
 
 
@@ -95,3 +95,19 @@ def test_skip_aggregation(pretrained_model, dev_file):
     inference = Inference(pretrained_model, skip_aggregation=True)
     scores = inference(dev_file)
     assert len(scores.data.shape) == 3
+
+
+def test_infer_output_dtype(trained):
+    protocol, model = trained
+    chunks = model.example_input_array
+
+    # use_amp has no effect on CPU: float32 in, float32 out
+    for use_amp in [False, True]:
+        inference = Inference(model, device="cpu", use_amp=use_amp)
+        outputs = inference.infer(chunks)
+        assert outputs.dtype == np.float32
+
+    # outputs of double precision models are not cast to float32
+    inference = Inference(model.double(), device="cpu")
+    outputs = inference.infer(chunks.double())
+    assert outputs.dtype == np.float64
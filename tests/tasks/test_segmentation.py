@@ -0,0 +1,40 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from pyannote.audio.tasks import Segmentation
+from pyannote.core import SlidingWindow
+from pyannote.database import FileFinder, get_protocol
+
+
+@pytest.fixture()
+def protocol():
+    return get_protocol(
+        "Debug.SpeakerDiarization.Debug", preprocessors={"audio": FileFinder()}
+    )
+
+
+@pytest.mark.parametrize("duration", [0.5, 2.0, 5.0])
+def test_max_num_speakers_matches_sliding_window(protocol, duration):
+
+    segmentation = Segmentation(protocol, duration=duration)
+    segmentation.setup()
+
+    # reference implementation: slide a window (with 1s step) over
+    # the whole training set and crop annotation at each location
+    num_speakers = []
+    for file in segmentation._train:
+        start = file["annotated"][0].start
+        end = file["annotated"][-1].end
+        window = SlidingWindow(start=start, end=end, duration=duration, step=1.0)
+        for chunk in window:
+            num_speakers.append(len(file["annotation"].crop(chunk).labels()))
+
+    num_speakers, counts = zip(*sorted(Counter(num_speakers).items()))
+    num_speakers, counts = np.array(num_speakers), np.array(counts)
+    expected = max(
+        2, num_speakers[np.where(np.cumsum(counts) / np.sum(counts) > 0.99)[0][0]]
+    )
+
+    assert segmentation.max_num_speakers == expected
@@ -0,0 +1,39 @@
+import torch
+
+from pyannote.audio.utils.loss import (
+    binary_cross_entropy,
+    binary_cross_entropy_with_logits,
+)
+
+
+def test_binary_cross_entropy_with_logits():
+
+    batch_size, num_frames, num_classes = 4, 100, 3
+
+    logits = torch.randn((batch_size, num_frames, num_classes))
+    target = torch.randint(0, 2, (batch_size, num_frames, num_classes)).float()
+    weight = torch.rand((batch_size, num_frames, 1))
+
+    torch.testing.assert_close(
+        binary_cross_entropy_with_logits(logits, target),
+        binary_cross_entropy(torch.sigmoid(logits), target),
+    )
+
+    torch.testing.assert_close(
+        binary_cross_entropy_with_logits(logits, target, weight=weight),
+        binary_cross_entropy(torch.sigmoid(logits), target, weight=weight),
+    )
+
+
+def test_binary_cross_entropy_with_logits_binary_target():
+
+    batch_size, num_frames = 4, 100
+
+    logits = torch.randn((batch_size, num_frames, 1))
+    target = torch.randint(0, 2, (batch_size, num_frames)).float()
+    weight = torch.rand((batch_size, num_frames, 1))
+
+    torch.testing.assert_close(
+        binary_cross_entropy_with_logits(logits, target, weight=weight),
+        binary_cross_entropy(torch.sigmoid(logits), target, weight=weight),
+    )
@@ -0,0 +1,83 @@
+import numpy as np
+
+from pyannote.audio.utils.signal import binarize
+
+
+def naive_binarize(scores, onset, offset, initial_state):
+    binarized = np.zeros_like(scores, dtype=bool)
+    for b, sample in enumerate(np.nan_to_num(scores)):
+        state = initial_state[b]
+        for t, score in enumerate(sample):
+            if score > onset:
+                state = True
+            elif score < offset:
+                state = False
+            binarized[b, t] = state
+    return binarized
+
+
+def test_binarize_hysteresis():
+
+    scores = np.array([[0.7, 0.5, 0.5, 0.3, 0.5, 0.7]])
+    expected = np.array([[True, True, True, False, False, True]])
+    np.testing.assert_array_equal(binarize(scores, onset=0.6, offset=0.4), expected)
+
+
+def test_binarize_nan():
+
+    # NaN scores are considered as 0.
+    scores = np.array([[np.nan, 0.7, np.nan, 0.5]])
+    expected = np.array([[False, True, False, False]])
+    np.testing.assert_array_equal(binarize(scores, onset=0.6, offset=0.4), expected)
+
+
+def test_binarize_initial_state():
+
+    scores = np.array([[0.5, 0.5, 0.7, 0.5]])
+
+    # default initial state compares first score to the mean of onset and offset
+    np.testing.assert_array_equal(
+        binarize(scores, onset=0.6, offset=0.4),
+        np.array([[True, True, True, True]]),
+    )
+
+    np.testing.assert_array_equal(
+        binarize(scores, onset=0.6, offset=0.4, initial_state=False),
+        np.array([[False, False, True, True]]),
+    )
+
+
+def test_binarize_no_well_defined_frame():
+
+    # no score is above onset or below offset: initial state is kept throughout
+    scores = np.array([[0.5, 0.5, 0.5], [0.45, 0.45, 0.45]])
+
+    np.testing.assert_array_equal(
+        binarize(scores, onset=0.6, offset=0.4),
+        np.array([[True, True, True], [False, False, False]]),
+    )
+
+    np.testing.assert_array_equal(
+        binarize(scores, onset=0.6, offset=0.4, initial_state=True),
+        np.ones((2, 3), dtype=bool),
+    )
+
+    np.testing.assert_array_equal(
+        binarize(scores, onset=0.6, offset=0.4, initial_state=np.array([False, True])),
+        np.array([[False, False, False], [True, True, True]]),
+    )
+
+
+def test_binarize_random():
+
+    rng = np.random.default_rng(0)
+    for _ in range(100):
+        batch_size, num_frames = rng.integers(1, 10), rng.integers(1, 50)
+        scores = rng.random((batch_size, num_frames))
+        scores[rng.random((batch_size, num_frames)) < 0.1] = np.nan
+        initial_state = rng.random((batch_size,)) < 0.5
+
+        np.testing.assert_array_equal(
+            binarize(scores, onset=0.7, offset=0.3, initial_state=initial_state),
+            naive_binarize(scores, 0.7, 0.3, initial_state),
+        )